@@ -3,9 +3,9 @@
 import discord
 
 # Hardcoded whitelist of admin user IDs (always have admin access)
-WHITELISTED_ADMIN_IDS: set[int] = {
+WHITELISTED_ADMIN_IDS: frozenset[int] = frozenset({
     320909318767509505,
-}
+})
 
 
 class AdminStore:
@@ -30,9 +30,9 @@ class AdminStore:
 
         return False
 
-    def get_all(self) -> set[int]:
+    def get_all(self) -> frozenset[int]:
         """Get all whitelisted admin user IDs."""
-        return WHITELISTED_ADMIN_IDS.copy()
+        return WHITELISTED_ADMIN_IDS
 
 
 # Global instance
@@ -1,18 +1,36 @@
 """OpenRouter API client with function calling support."""
 
-import json
 from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
+import orjson
 
 from src.config import settings
 
 
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
+# Shared across all OpenRouterClient instances so concurrent requests reuse
+# warm TLS/TCP connections instead of paying a handshake per instance.
+_shared_client = httpx.AsyncClient(
+    http2=True,
+    timeout=120.0,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+)
 
-@dataclass
+
+def _parse_tool_arguments(raw: str) -> dict[str, Any]:
+    """Parse a tool-call arguments JSON string, tolerating malformed output."""
+    if not raw:
+        return {}
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return {}
+
+
+@dataclass(slots=True)
 class ToolCall:
     """Represents a tool call from the LLM."""
 
@@ -21,7 +39,7 @@ class ToolCall:
     arguments: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Chat message."""
 
@@ -31,69 +49,109 @@ class Message:
     tool_call_id: str | None = None  # For tool responses
     name: str | None = None  # Tool name for tool responses
     images: list[str] = field(default_factory=list)  # Base64 images
+    # Formatted image_url parts, built once on first serialization so the
+    # (potentially huge) data URIs aren't re-concatenated every LLM round
+    _image_parts: list[dict] | None = field(default=None, repr=False)
+    # Serialized API dict; messages in the agent loop are append-only and
+    # never mutated after creation, so caching the first build is safe
+    _api_cache: dict | None = field(default=None, repr=False)
 
     def to_api_format(self) -> dict:
         """Convert to OpenRouter API format."""
-        msg: dict[str, Any] = {"role": self.role}
-
-        if self.role == "user" and self.images:
-            # Multi-modal message with images
-            content_parts: list[dict] = []
-            if self.content:
-                content_parts.append({"type": "text", "text": self.content})
-            for img_b64 in self.images:
-                content_parts.append(
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{img_b64}"},
-                    }
-                )
-            msg["content"] = content_parts
-        elif self.content is not None:
-            msg["content"] = self.content
-
-        if self.tool_calls:
-            msg["tool_calls"] = [
-                {
-                    "id": tc.id,
-                    "type": "function",
-                    "function": {
-                        "name": tc.name,
-                        "arguments": json.dumps(tc.arguments),
-                    },
-                }
-                for tc in self.tool_calls
-            ]
+        if self._api_cache is None:
+            self._api_cache = _API_BUILDERS[self.role](self)
+        return self._api_cache
 
-        if self.tool_call_id:
-            msg["role"] = "tool"
-            msg["tool_call_id"] = self.tool_call_id
-            if self.name:
-                msg["name"] = self.name
 
-        return msg
+def _system_to_api(m: Message) -> dict:
+    return {"role": "system", "content": m.content}
 
 
-@dataclass
+def _user_to_api(m: Message) -> dict:
+    if m.images:
+        # Multi-modal message with images
+        if m._image_parts is None:
+            m._image_parts = [
+                {
+                    "type": "image_url",
+                    "image_url": {"url": f"data:image/png;base64,{img_b64}"},
+                }
+                for img_b64 in m.images
+            ]
+        content_parts: list[dict] = []
+        if m.content:
+            content_parts.append({"type": "text", "text": m.content})
+        content_parts.extend(m._image_parts)
+        return {"role": "user", "content": content_parts}
+    if m.content is not None:
+        return {"role": "user", "content": m.content}
+    return {"role": "user"}
+
+
+def _assistant_to_api(m: Message) -> dict:
+    msg: dict[str, Any] = {"role": "assistant"}
+    if m.content is not None:
+        msg["content"] = m.content
+    if m.tool_calls:
+        msg["tool_calls"] = [
+            {
+                "id": tc.id,
+                "type": "function",
+                "function": {
+                    "name": tc.name,
+                    "arguments": orjson.dumps(tc.arguments).decode(),
+                },
+            }
+            for tc in m.tool_calls
+        ]
+    return msg
+
+
+def _tool_to_api(m: Message) -> dict:
+    msg: dict[str, Any] = {"role": "tool"}
+    if m.content is not None:
+        msg["content"] = m.content
+    if m.tool_call_id:
+        msg["tool_call_id"] = m.tool_call_id
+        if m.name:
+            msg["name"] = m.name
+    return msg
+
+
+# Role-specialized builders: each constructs only the keys relevant to its
+# role instead of walking the full conditional ladder per message.
+_API_BUILDERS = {
+    "system": _system_to_api,
+    "user": _user_to_api,
+    "assistant": _assistant_to_api,
+    "tool": _tool_to_api,
+}
+
+
+@dataclass(slots=True)
 class Tool:
     """Tool definition for function calling."""
 
     name: str
     description: str
     parameters: dict[str, Any]
+    # Tool definitions are static, so the API form is built exactly once
+    _api_cache: dict | None = field(default=None, repr=False)
 
     def to_api_format(self) -> dict:
-        return {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": self.parameters,
-            },
-        }
-
-
-@dataclass
+        if self._api_cache is None:
+            self._api_cache = {
+                "type": "function",
+                "function": {
+                    "name": self.name,
+                    "description": self.description,
+                    "parameters": self.parameters,
+                },
+            }
+        return self._api_cache
+
+
+@dataclass(slots=True)
 class CompletionResponse:
     """Response from the LLM."""
 
@@ -112,18 +170,33 @@ class OpenRouterClient:
     ):
         self.api_key = api_key or settings.openrouter_api_key
         self.model = model or settings.openrouter_model
-        self._client = httpx.AsyncClient(timeout=120.0)
+        self._client = _shared_client
 
     async def chat(
         self,
         messages: list[Message],
         tools: list[Tool] | None = None,
         temperature: float = 0.3,
+        api_messages: list[dict] | None = None,
+        stream: bool = True,
     ) -> CompletionResponse:
-        """Send chat completion request."""
+        """Send chat completion request.
+
+        api_messages may carry the conversation already serialized via
+        Message.to_api_format; callers that keep a running serialized list
+        (the agent loop) avoid re-serializing the whole history per round.
+
+        With stream=True (the default) the request uses SSE so tokens and
+        tool-call deltas are consumed as they arrive instead of waiting for
+        the full response body. stream=False keeps the buffered JSON path
+        as a fallback.
+        """
+        if api_messages is None:
+            api_messages = [m.to_api_format() for m in messages]
+
         payload: dict[str, Any] = {
             "model": self.model,
-            "messages": [m.to_api_format() for m in messages],
+            "messages": api_messages,
             "temperature": temperature,
         }
 
@@ -138,13 +211,19 @@ class OpenRouterClient:
             "X-Title": "Xenon Support Bot",
         }
 
+        if stream:
+            payload["stream"] = True
+            return await self._chat_stream(payload, headers)
+
+        # Serialize with orjson instead of letting httpx run the payload
+        # through stdlib json
         resp = await self._client.post(
             OPENROUTER_API_URL,
-            json=payload,
+            content=orjson.dumps(payload),
             headers=headers,
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
 
         choice = data["choices"][0]
         message = choice["message"]
@@ -154,10 +233,7 @@ class OpenRouterClient:
         if "tool_calls" in message and message["tool_calls"]:
             for tc in message["tool_calls"]:
                 func = tc["function"]
-                try:
-                    args = json.loads(func["arguments"])
-                except json.JSONDecodeError:
-                    args = {}
+                args = _parse_tool_arguments(func["arguments"])
                 tool_calls.append(
                     ToolCall(
                         id=tc["id"],
@@ -172,5 +248,70 @@ class OpenRouterClient:
             finish_reason=choice.get("finish_reason", "stop"),
         )
 
+    async def _chat_stream(self, payload: dict, headers: dict) -> CompletionResponse:
+        """Consume an SSE chat completion, accumulating deltas as they arrive."""
+        content_parts: list[str] = []
+        # index -> partial tool call; argument fragments arrive across chunks
+        partial_calls: dict[int, dict[str, Any]] = {}
+        finish_reason = "stop"
+
+        async with self._client.stream(
+            "POST",
+            OPENROUTER_API_URL,
+            content=orjson.dumps(payload),
+            headers=headers,
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data_str = line[6:]
+                if data_str == "[DONE]":
+                    break
+                try:
+                    chunk = orjson.loads(data_str)
+                except orjson.JSONDecodeError:
+                    continue
+
+                choices = chunk.get("choices")
+                if not choices:
+                    continue
+                choice = choices[0]
+                delta = choice.get("delta") or {}
+
+                if delta.get("content"):
+                    content_parts.append(delta["content"])
+
+                for tc in delta.get("tool_calls") or []:
+                    partial = partial_calls.setdefault(
+                        tc.get("index", 0),
+                        {"id": "", "name": "", "arguments": []},
+                    )
+                    if tc.get("id"):
+                        partial["id"] = tc["id"]
+                    func = tc.get("function") or {}
+                    if func.get("name"):
+                        partial["name"] = func["name"]
+                    if func.get("arguments"):
+                        partial["arguments"].append(func["arguments"])
+
+                if choice.get("finish_reason"):
+                    finish_reason = choice["finish_reason"]
+
+        tool_calls = [
+            ToolCall(
+                id=partial["id"],
+                name=partial["name"],
+                arguments=_parse_tool_arguments("".join(partial["arguments"])),
+            )
+            for _, partial in sorted(partial_calls.items())
+        ]
+
+        return CompletionResponse(
+            content="".join(content_parts) or None,
+            tool_calls=tool_calls,
+            finish_reason=finish_reason,
+        )
+
     async def close(self):
-        await self._client.aclose()
+        """No-op kept for API compatibility; the HTTP client is shared."""
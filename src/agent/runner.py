@@ -1,10 +1,13 @@
 """Agentic loop runner - executes tools one at a time with live updates."""
 
-import json
+import asyncio
 import re
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from itertools import islice
 from typing import AsyncIterator, Callable, Awaitable
 
+import orjson
+
 from src.agent.client import OpenRouterClient, Message
 from src.agent.tools import TOOLS, execute_tool, get_tool_emoji, get_tool_description
 from src.docs.store import doc_store
@@ -12,8 +15,11 @@ from src.docs.store import doc_store
 
 MAX_TOOL_CALLS = 10  # Prevent infinite loops
 
+# Compiled once; matched on every final LLM response
+_JSON_FENCE_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
+
 
-@dataclass
+@dataclass(slots=True)
 class ButtonData:
     """A button to include in the response."""
 
@@ -23,7 +29,7 @@ class ButtonData:
     action: str | None = None  # For action buttons: "resolved", "ticket"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentStep:
     """A single step in the agent's execution."""
 
@@ -34,14 +40,26 @@ class AgentStep:
     response: str | None = None
     emoji: str = ""
     description: str = ""
-    buttons: list[ButtonData] = field(default_factory=list)
+    # Shared empty tuple default avoids a fresh list per step
+    buttons: tuple[ButtonData, ...] = ()
+
+
+# Built prompt keyed on doc_store.version so the manifest query and string
+# formatting only run again when the docs actually change
+_prompt_cache: tuple[int, str] | None = None
 
 
 async def build_system_prompt() -> str:
-    """Build the system prompt with available doc titles."""
-    doc_titles = await doc_store.get_doc_titles_for_prompt()
+    """Build the system prompt with a summary of the available docs."""
+    global _prompt_cache
 
-    return f"""You are a helpful support assistant for Xenon, a Discord bot for server backups and templates.
+    version = doc_store.version
+    if _prompt_cache is not None and _prompt_cache[0] == version:
+        return _prompt_cache[1]
+
+    doc_count = len(await doc_store.get_manifest())
+
+    prompt = f"""You are a helpful support assistant for Xenon, a Discord bot for server backups and templates.
 
 Your job is to answer questions about Xenon based on the official documentation.
 
@@ -55,7 +73,7 @@ Your job is to answer questions about Xenon based on the official documentation.
 7. If you can't find the answer in the docs, say "I couldn't find this in the documentation." The user can click "Community Support" to ask the community for help. Do NOT invent support emails or other contact methods.
 
 ## Available Documentation:
-{doc_titles}
+{doc_count} documentation pages are available. Call the list_docs tool to enumerate them with their slugs.
 
 To read a document's content, use the get_doc tool with the slug.
 To search across all docs, use search_docs.
@@ -82,56 +100,51 @@ The documentation base URL is: https://wiki.xenon.bot/
 
 Always cite which documentation page your answer comes from in the response text."""
 
+    _prompt_cache = (version, prompt)
+    return prompt
 
-def parse_response_with_buttons(content: str) -> tuple[str, list[ButtonData]]:
-    """Parse agent response, extracting buttons if present."""
-    buttons: list[ButtonData] = []
 
-    # Try to find JSON in the response
-    # Look for ```json ... ``` blocks first
-    json_match = re.search(r"```json\s*(\{.*?\})\s*```", content, re.DOTALL)
-    if json_match:
+def _extract_response_payload(data: object) -> tuple[str, tuple[ButtonData, ...]] | None:
+    """Pull response text and buttons out of parsed JSON, if shaped right."""
+    if not (isinstance(data, dict) and "response" in data):
+        return None
+
+    buttons = tuple(
+        ButtonData(
+            type=btn.get("type", "link"),
+            label=btn.get("label", ""),
+            url=btn.get("url"),
+            action=btn.get("action"),
+        )
+        for btn in data.get("buttons", [])
+        if isinstance(btn, dict) and "type" in btn and "label" in btn
+    )
+    return data.get("response", ""), buttons
+
+
+def parse_response_with_buttons(content: str) -> tuple[str, tuple[ButtonData, ...]]:
+    """Parse agent response, extracting buttons if present."""
+    # Decide up-front which single parse attempt makes sense: whole-content
+    # JSON, a fenced ```json block, or neither. Plain prose answers - the
+    # common case - return immediately without touching a JSON parser.
+    candidate: str | None = None
+    if content.lstrip().startswith("{"):
+        candidate = content
+    elif "```json" in content:
+        json_match = _JSON_FENCE_RE.search(content)
+        if json_match:
+            candidate = json_match.group(1)
+
+    if candidate is not None:
         try:
-            data = json.loads(json_match.group(1))
-            if isinstance(data, dict) and "response" in data:
-                response_text = data.get("response", "")
-                raw_buttons = data.get("buttons", [])
-                for btn in raw_buttons:
-                    if isinstance(btn, dict) and "type" in btn and "label" in btn:
-                        buttons.append(
-                            ButtonData(
-                                type=btn.get("type", "link"),
-                                label=btn.get("label", ""),
-                                url=btn.get("url"),
-                                action=btn.get("action"),
-                            )
-                        )
-                return response_text, buttons
-        except json.JSONDecodeError:
-            pass
-
-    # Try parsing the whole content as JSON
-    try:
-        data = json.loads(content)
-        if isinstance(data, dict) and "response" in data:
-            response_text = data.get("response", "")
-            raw_buttons = data.get("buttons", [])
-            for btn in raw_buttons:
-                if isinstance(btn, dict) and "type" in btn and "label" in btn:
-                    buttons.append(
-                        ButtonData(
-                            type=btn.get("type", "link"),
-                            label=btn.get("label", ""),
-                            url=btn.get("url"),
-                            action=btn.get("action"),
-                        )
-                    )
-            return response_text, buttons
-    except json.JSONDecodeError:
-        pass
+            parsed = _extract_response_payload(orjson.loads(candidate))
+        except orjson.JSONDecodeError:
+            parsed = None
+        if parsed is not None:
+            return parsed
 
     # No valid JSON found, return content as-is
-    return content, buttons
+    return content, ()
 
 
 class AgentRunner:
@@ -159,19 +172,30 @@ class AgentRunner:
             images: List of base64-encoded images
             channel_context: Recent channel messages for context [{"author": "...", "content": "..."}]
         """
-        # Build messages
-        messages: list[Message] = [Message(role="system", content=await build_system_prompt())]
+        # Build messages, keeping a parallel pre-serialized list so the
+        # (static) system prompt and earlier turns aren't re-serialized on
+        # every LLM round in the loop below.
+        messages: list[Message] = []
+        api_messages: list[dict] = []
+
+        def add_message(msg: Message) -> None:
+            messages.append(msg)
+            api_messages.append(msg.to_api_format())
 
-        # Add history (last 5 messages)
+        add_message(Message(role="system", content=await build_system_prompt()))
+
+        # Add history (last 5 messages); islice avoids copying the tail of a
+        # potentially long list
         if history:
-            for msg in history[-5:]:
-                messages.append(Message(role=msg["role"], content=msg["content"]))
+            for msg in islice(history, max(0, len(history) - 5), None):
+                add_message(Message(role=msg["role"], content=msg["content"]))
 
         # Build user message with channel context
         user_content = user_message
         if channel_context:
             context_text = "\n".join(
-                f"[{msg['author']}]: {msg['content']}" for msg in channel_context[-10:]
+                f"[{msg['author']}]: {msg['content']}"
+                for msg in islice(channel_context, max(0, len(channel_context) - 10), None)
             )
             user_content = f"""## Recent channel messages for context:
 {context_text}
@@ -180,7 +204,7 @@ class AgentRunner:
 {user_message}"""
 
         # Add current user message
-        messages.append(
+        add_message(
             Message(
                 role="user",
                 content=user_content,
@@ -192,68 +216,77 @@ class AgentRunner:
 
         while tool_call_count < MAX_TOOL_CALLS:
             # Call LLM
-            response = await self.client.chat(messages, tools=TOOLS)
+            response = await self.client.chat(messages, tools=TOOLS, api_messages=api_messages)
 
             # Check for tool calls
             if response.tool_calls:
-                tool_call = response.tool_calls[0]  # Process one at a time
-                tool_call_count += 1
-
-                # Yield the tool call step
-                yield AgentStep(
-                    type="tool_call",
-                    tool_name=tool_call.name,
-                    tool_args=tool_call.arguments,
-                    emoji=get_tool_emoji(tool_call.name),
-                    description=get_tool_description(tool_call.name, tool_call.arguments),
-                )
+                tool_calls = response.tool_calls
+                tool_call_count += len(tool_calls)
 
-                # Execute the tool
-                result = await execute_tool(tool_call.name, tool_call.arguments)
+                # Yield all tool call steps before dispatching
+                for tool_call in tool_calls:
+                    yield AgentStep(
+                        type="tool_call",
+                        tool_name=tool_call.name,
+                        tool_args=tool_call.arguments,
+                        emoji=get_tool_emoji(tool_call.name),
+                        description=get_tool_description(tool_call.name, tool_call.arguments),
+                    )
 
-                # Call the callback if provided
-                if on_tool_call:
-                    await on_tool_call(tool_call.name, tool_call.arguments, result)
+                # Execute the round's tool calls concurrently instead of
+                # forcing one LLM round-trip per tool
+                results = await asyncio.gather(
+                    *(execute_tool(tc.name, tc.arguments) for tc in tool_calls)
+                )
 
-                # Check for relevance gate
-                if tool_call.name == "check_relevance":
-                    if not result.get("is_relevant", False):
-                        yield AgentStep(
-                            type="irrelevant",
-                            response="IRRELEVANT",
-                            description="Question is not about Xenon",
-                        )
-                        return
+                for tool_call, result in zip(tool_calls, results):
+                    # Call the callback if provided
+                    if on_tool_call:
+                        await on_tool_call(tool_call.name, tool_call.arguments, result)
+
+                    # Check for relevance gate
+                    if tool_call.name == "check_relevance":
+                        if not result.get("is_relevant", False):
+                            yield AgentStep(
+                                type="irrelevant",
+                                response="IRRELEVANT",
+                                description="Question is not about Xenon",
+                            )
+                            return
 
-                # Yield the tool result step
-                yield AgentStep(
-                    type="tool_result",
-                    tool_name=tool_call.name,
-                    tool_result=result,
-                )
+                    # Yield the tool result step
+                    yield AgentStep(
+                        type="tool_result",
+                        tool_name=tool_call.name,
+                        tool_result=result,
+                    )
 
-                # Add tool call and result to messages
-                messages.append(
+                # Feed the round back: one assistant message carrying all
+                # tool calls, then one tool message per result
+                add_message(
                     Message(
                         role="assistant",
-                        tool_calls=[tool_call],
+                        tool_calls=list(tool_calls),
                     )
                 )
-                messages.append(
-                    Message(
-                        role="tool",
-                        content=json.dumps(result),
-                        tool_call_id=tool_call.id,
-                        name=tool_call.name,
+                for tool_call, result in zip(tool_calls, results):
+                    add_message(
+                        Message(
+                            role="tool",
+                            content=orjson.dumps(result).decode(),
+                            tool_call_id=tool_call.id,
+                            name=tool_call.name,
+                        )
                     )
-                )
 
             else:
                 # No tool calls - we have a final response
                 final_content = response.content or ""
 
-                # Check if model decided it's irrelevant
-                if "IRRELEVANT" in final_content.upper():
+                # Check if model decided it's irrelevant. The system prompt
+                # mandates the exact uppercase marker, so a direct substring
+                # check avoids copying the whole response via .upper().
+                if "IRRELEVANT" in final_content:
                     yield AgentStep(
                         type="irrelevant",
                         response=final_content,
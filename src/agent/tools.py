@@ -1,5 +1,7 @@
 """Agent tools for Xenon support bot."""
 
+import asyncio
+from functools import lru_cache
 from typing import Any
 
 from src.agent.client import Tool
@@ -32,6 +34,17 @@ TOOLS: list[Tool] = [
             "required": ["reasoning", "is_relevant"],
         },
     ),
+    Tool(
+        name="list_docs",
+        description=(
+            "List all available Xenon documentation pages with their titles and slugs. "
+            "Use this when you need to know which docs exist before reading one with get_doc."
+        ),
+        parameters={
+            "type": "object",
+            "properties": {},
+        },
+    ),
     Tool(
         name="search_docs",
         description=(
@@ -70,65 +83,100 @@ TOOLS: list[Tool] = [
 ]
 
 
-async def execute_tool(name: str, arguments: dict[str, Any]) -> dict[str, Any]:
-    """Execute a tool and return the result."""
+async def _check_relevance(arguments: dict[str, Any]) -> dict[str, Any]:
+    # This tool is evaluated by the LLM itself - we just return its decision
+    return {
+        "is_relevant": arguments.get("is_relevant", False),
+        "reasoning": arguments.get("reasoning", ""),
+    }
 
-    if name == "check_relevance":
-        # This tool is evaluated by the LLM itself - we just return its decision
-        return {
-            "is_relevant": arguments.get("is_relevant", False),
-            "reasoning": arguments.get("reasoning", ""),
-        }
 
-    elif name == "search_docs":
-        query = arguments.get("query", "")
-        if not query:
-            return {"error": "No query provided"}
+async def _list_docs(arguments: dict[str, Any]) -> dict[str, Any]:
+    return {"docs": await doc_store.get_doc_titles_for_prompt()}
+
+
+# Search results memoized until the index is rebuilt; repeated questions
+# tend to trigger the same queries
+_search_cache: dict[tuple[str, int], list[dict]] = {}
+_SEARCH_CACHE_MAX = 256
+
+
+async def _search_docs(arguments: dict[str, Any]) -> dict[str, Any]:
+    query = arguments.get("query", "")
+    if not query:
+        return {"error": "No query provided"}
 
-        results = doc_search.search(query, limit=5)
-        if not results:
-            return {"results": [], "message": "No matching documentation found"}
+    cache_key = (query, doc_search.version)
+    results = _search_cache.get(cache_key)
+    if results is None:
+        # Whoosh search is synchronous (disk + scoring work); run it off the
+        # event loop so concurrent questions aren't stalled
+        results = await asyncio.to_thread(doc_search.search, query, 5)
+        if len(_search_cache) >= _SEARCH_CACHE_MAX:
+            _search_cache.clear()
+        _search_cache[cache_key] = results
 
+    if not results:
+        return {"results": [], "message": "No matching documentation found"}
+
+    # Results come back from DocSearch already in tool-result shape
+    return {"results": results}
+
+
+async def _get_doc(arguments: dict[str, Any]) -> dict[str, Any]:
+    slug = arguments.get("slug", "")
+    if not slug:
+        return {"error": "No slug provided"}
+
+    text = await doc_store.get_doc_text(slug)
+    if not text:
         return {
-            "results": [
-                {
-                    "slug": r["slug"],
-                    "title": r["title"],
-                    "heading": r["heading"],
-                    "snippet": r["snippet"],
-                }
-                for r in results
-            ]
+            "error": f"Document '{slug}' not found",
+            "available_slugs": await doc_store.get_slugs(),
         }
 
-    elif name == "get_doc":
-        slug = arguments.get("slug", "")
-        if not slug:
-            return {"error": "No slug provided"}
+    return {"slug": slug, "content": text}
+
+
+# Dispatch table: one dict lookup per call instead of an if/elif chain
+_HANDLERS = {
+    "check_relevance": _check_relevance,
+    "list_docs": _list_docs,
+    "search_docs": _search_docs,
+    "get_doc": _get_doc,
+}
+
+TOOL_EMOJIS = {
+    "check_relevance": "🤔",
+    "list_docs": "📑",
+    "search_docs": "🔍",
+    "get_doc": "📖",
+}
 
-        text = await doc_store.get_doc_text(slug)
-        if not text:
-            manifest = await doc_store.get_manifest()
-            available = [d.slug for d in manifest]
-            return {
-                "error": f"Document '{slug}' not found",
-                "available_slugs": available,
-            }
 
-        return {"slug": slug, "content": text}
+# A hallucinating model tends to repeat the same bogus tool name, so the
+# formatted messages are worth interning
+@lru_cache(maxsize=64)
+def _unknown_tool_error(name: str) -> str:
+    return f"Unknown tool: {name}"
 
-    else:
-        return {"error": f"Unknown tool: {name}"}
+
+@lru_cache(maxsize=64)
+def _generic_tool_description(name: str) -> str:
+    return f"Running {name}..."
+
+
+async def execute_tool(name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    """Execute a tool and return the result."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return {"error": _unknown_tool_error(name)}
+    return await handler(arguments)
 
 
 def get_tool_emoji(name: str) -> str:
     """Get emoji for a tool to display in Discord."""
-    emojis = {
-        "check_relevance": "🤔",
-        "search_docs": "🔍",
-        "get_doc": "📖",
-    }
-    return emojis.get(name, "🔧")
+    return TOOL_EMOJIS.get(name, "🔧")
 
 
 def get_tool_description(name: str, arguments: dict[str, Any]) -> str:
@@ -136,6 +184,9 @@ def get_tool_description(name: str, arguments: dict[str, Any]) -> str:
     if name == "check_relevance":
         return "Checking if this question is about Xenon..."
 
+    elif name == "list_docs":
+        return "Listing available documentation..."
+
     elif name == "search_docs":
         query = arguments.get("query", "")
         return f'Searching docs for "{query}"...'
@@ -144,4 +195,4 @@ def get_tool_description(name: str, arguments: dict[str, Any]) -> str:
         slug = arguments.get("slug", "")
         return f'Reading "{slug}" documentation...'
 
-    return f"Running {name}..."
+    return _generic_tool_description(name)
@@ -1,14 +1,18 @@
 """Analytics storage using PostgreSQL for question tracking."""
 
-import json
+import asyncio
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
+import asyncpg
+import orjson
+
 from src.database import get_pool
 
 
-@dataclass
+@dataclass(slots=True)
 class QuestionRecord:
     """A logged question with metadata."""
 
@@ -22,9 +26,30 @@ class QuestionRecord:
     created_at: datetime
 
 
+# Tool-call inserts are batched by a background flusher
+TOOL_CALL_BATCH_SIZE = 128
+TOOL_CALL_FLUSH_DELAY = 0.05  # Seconds to wait for more rows before writing
+
+# Stats queries are cached briefly; dashboards tolerate slightly stale numbers
+STATS_CACHE_TTL = 30.0  # Seconds
+
+
 class Analytics:
     """PostgreSQL-based analytics for question tracking."""
 
+    def __init__(self):
+        self._pool: asyncpg.Pool | None = None
+        self._tool_queue: asyncio.Queue[tuple[int, str, str, str]] = asyncio.Queue()
+        self._flush_task: asyncio.Task | None = None
+        # (guild_id, days) or None for global -> (expiry, stats dict)
+        self._stats_cache: dict[tuple[int, int] | None, tuple[float, dict[str, Any]]] = {}
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        """Resolve the connection pool once and reuse the handle."""
+        if self._pool is None:
+            self._pool = await get_pool()
+        return self._pool
+
     async def log_question(
         self,
         guild_id: int,
@@ -33,7 +58,7 @@ class Analytics:
         question: str,
     ) -> int:
         """Log a new question, returns question_id."""
-        pool = await get_pool()
+        pool = await self._get_pool()
         async with pool.acquire() as conn:
             row = await conn.fetchrow(
                 """
@@ -46,6 +71,7 @@ class Analytics:
                 channel_id,
                 question,
             )
+            self._stats_cache.clear()
             return row["id"]
 
     async def log_tool_call(
@@ -55,59 +81,131 @@ class Analytics:
         arguments: dict[str, Any],
         result: dict[str, Any],
     ) -> None:
-        """Log a tool call for a question."""
-        pool = await get_pool()
+        """Queue a tool call for the background batch flusher."""
+        self._tool_queue.put_nowait(
+            (
+                question_id,
+                tool_name,
+                orjson.dumps(arguments).decode(),
+                orjson.dumps(result).decode(),
+            )
+        )
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Drain queued tool calls and insert them in batches.
+
+        Amortizes transaction overhead across bursts: one INSERT batch per
+        flush window instead of one commit per tool call.
+        """
+        while True:
+            rows = [await self._tool_queue.get()]
+            # Short window for the rest of a burst to arrive
+            await asyncio.sleep(TOOL_CALL_FLUSH_DELAY)
+            while len(rows) < TOOL_CALL_BATCH_SIZE:
+                try:
+                    rows.append(self._tool_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._write_tool_calls(rows)
+            except Exception as e:
+                print(f"Failed to flush {len(rows)} tool calls: {e}")
+
+    async def _write_tool_calls(self, rows: list[tuple[int, str, str, str]]) -> None:
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            # COPY is the cheapest bulk-insert path asyncpg offers
+            await conn.copy_records_to_table(
+                "tool_calls",
+                records=rows,
+                columns=["question_id", "tool_name", "arguments", "result"],
+            )
+
+    async def flush_pending(self) -> None:
+        """Write any queued tool calls immediately (for clean shutdown)."""
+        rows = []
+        while True:
+            try:
+                rows.append(self._tool_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        if rows:
+            await self._write_tool_calls(rows)
+
+    async def set_flags(
+        self,
+        question_id: int,
+        *,
+        answered: bool | None = None,
+        community: bool | None = None,
+    ) -> None:
+        """Set question flags in one UPDATE; None leaves a flag unchanged."""
+        pool = await self._get_pool()
         async with pool.acquire() as conn:
             await conn.execute(
                 """
-                INSERT INTO tool_calls (question_id, tool_name, arguments, result)
-                VALUES ($1, $2, $3, $4)
+                UPDATE questions
+                SET answered = COALESCE($2, answered),
+                    community_support_clicked = COALESCE($3, community_support_clicked)
+                WHERE id = $1
                 """,
                 question_id,
-                tool_name,
-                json.dumps(arguments),
-                json.dumps(result),
+                answered,
+                community,
             )
+        self._stats_cache.clear()
 
     async def mark_answered(self, question_id: int) -> None:
         """Mark a question as answered."""
-        pool = await get_pool()
-        async with pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE questions SET answered = TRUE WHERE id = $1",
-                question_id,
-            )
+        await self.set_flags(question_id, answered=True)
 
     async def mark_community_support(self, question_id: int) -> None:
         """Mark that community support was clicked."""
-        pool = await get_pool()
-        async with pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE questions SET community_support_clicked = TRUE WHERE id = $1",
-                question_id,
-            )
+        await self.set_flags(question_id, community=True)
 
     async def get_unanswered(
         self,
         guild_id: int,
         days: int = 7,
         limit: int = 10,
+        before: datetime | None = None,
     ) -> list[QuestionRecord]:
-        """Get recent unanswered questions."""
+        """Get recent unanswered questions.
+
+        Pass the created_at of the last row from a previous call as `before`
+        to fetch the next page (keyset pagination - no OFFSET scan).
+        """
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        pool = await get_pool()
+        pool = await self._get_pool()
         async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT * FROM questions
-                WHERE guild_id = $1 AND answered = FALSE AND created_at >= $2
-                ORDER BY created_at DESC
-                LIMIT $3
-                """,
-                guild_id,
-                cutoff,
-                limit,
-            )
+            if before is not None:
+                rows = await conn.fetch(
+                    """
+                    SELECT * FROM questions
+                    WHERE guild_id = $1 AND answered = FALSE
+                      AND created_at >= $2 AND created_at < $3
+                    ORDER BY created_at DESC
+                    LIMIT $4
+                    """,
+                    guild_id,
+                    cutoff,
+                    before,
+                    limit,
+                )
+            else:
+                rows = await conn.fetch(
+                    """
+                    SELECT * FROM questions
+                    WHERE guild_id = $1 AND answered = FALSE AND created_at >= $2
+                    ORDER BY created_at DESC
+                    LIMIT $3
+                    """,
+                    guild_id,
+                    cutoff,
+                    limit,
+                )
             return [
                 QuestionRecord(
                     id=row["id"],
@@ -122,100 +220,100 @@ class Analytics:
                 for row in rows
             ]
 
+    def _cached_stats(
+        self, key: tuple[int, int] | None
+    ) -> dict[str, Any] | None:
+        """Return cached stats for key if still fresh."""
+        entry = self._stats_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _store_stats(self, key: tuple[int, int] | None, stats: dict[str, Any]) -> None:
+        self._stats_cache[key] = (time.monotonic() + STATS_CACHE_TTL, stats)
+
     async def get_stats(self, guild_id: int, days: int = 7) -> dict[str, Any]:
         """Get analytics stats for a guild."""
+        cached = self._cached_stats((guild_id, days))
+        if cached is not None:
+            return cached
+
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        pool = await get_pool()
+        pool = await self._get_pool()
         async with pool.acquire() as conn:
-            # Total questions
-            total = await conn.fetchval(
-                "SELECT COUNT(*) FROM questions WHERE guild_id = $1 AND created_at >= $2",
-                guild_id,
-                cutoff,
-            )
-
-            # Answered questions
-            answered = await conn.fetchval(
+            # One pass over the qualifying rows instead of three COUNT queries
+            row = await conn.fetchrow(
                 """
-                SELECT COUNT(*) FROM questions
-                WHERE guild_id = $1 AND answered = TRUE AND created_at >= $2
+                SELECT COUNT(*) AS total,
+                       COUNT(*) FILTER (WHERE answered) AS answered,
+                       COUNT(*) FILTER (WHERE community_support_clicked) AS community_clicked
+                FROM questions
+                WHERE guild_id = $1 AND created_at >= $2
                 """,
                 guild_id,
                 cutoff,
             )
 
-            # Community support clicked
-            community_clicked = await conn.fetchval(
-                """
-                SELECT COUNT(*) FROM questions
-                WHERE guild_id = $1 AND community_support_clicked = TRUE AND created_at >= $2
-                """,
-                guild_id,
-                cutoff,
-            )
+        total = row["total"]
+        answered = row["answered"]
 
-            return {
-                "total": total,
-                "answered": answered,
-                "unanswered": total - answered,
-                "answer_rate": (answered / total * 100) if total > 0 else 0,
-                "community_support_clicked": community_clicked,
-                "days": days,
-            }
+        stats = {
+            "total": total,
+            "answered": answered,
+            "unanswered": total - answered,
+            "answer_rate": (answered / total * 100) if total > 0 else 0,
+            "community_support_clicked": row["community_clicked"],
+            "days": days,
+        }
+        self._store_stats((guild_id, days), stats)
+        return stats
 
     async def get_global_stats(self) -> dict[str, Any]:
         """Get global analytics stats across all guilds."""
-        pool = await get_pool()
-        async with pool.acquire() as conn:
-            # Total questions all time
-            total_questions = await conn.fetchval("SELECT COUNT(*) FROM questions")
+        cached = self._cached_stats(None)
+        if cached is not None:
+            return cached
 
-            # Answered questions all time
-            total_answered = await conn.fetchval(
-                "SELECT COUNT(*) FROM questions WHERE answered = TRUE"
-            )
-
-            # Total tool calls
-            total_tool_calls = await conn.fetchval("SELECT COUNT(*) FROM tool_calls")
-
-            # Unique users
-            unique_users = await conn.fetchval(
-                "SELECT COUNT(DISTINCT user_id) FROM questions"
-            )
-
-            # Unique guilds
-            unique_guilds = await conn.fetchval(
-                "SELECT COUNT(DISTINCT guild_id) FROM questions"
-            )
+        now = datetime.now(timezone.utc)
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        week_ago = now - timedelta(days=7)
 
-            # Questions today
-            today = datetime.now(timezone.utc).replace(
-                hour=0, minute=0, second=0, microsecond=0
-            )
-            questions_today = await conn.fetchval(
-                "SELECT COUNT(*) FROM questions WHERE created_at >= $1",
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            # One scan of questions covers all six counts; tool_calls needs
+            # its own (cheap) COUNT on a separate table
+            row = await conn.fetchrow(
+                """
+                SELECT COUNT(*) AS total_questions,
+                       COUNT(*) FILTER (WHERE answered) AS total_answered,
+                       COUNT(DISTINCT user_id) AS unique_users,
+                       COUNT(DISTINCT guild_id) AS unique_guilds,
+                       COUNT(*) FILTER (WHERE created_at >= $1) AS questions_today,
+                       COUNT(*) FILTER (WHERE created_at >= $2) AS questions_week
+                FROM questions
+                """,
                 today,
-            )
-
-            # Questions this week
-            week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-            questions_week = await conn.fetchval(
-                "SELECT COUNT(*) FROM questions WHERE created_at >= $1",
                 week_ago,
             )
+            total_tool_calls = await conn.fetchval("SELECT COUNT(*) FROM tool_calls")
+
+        total_questions = row["total_questions"]
+        total_answered = row["total_answered"]
 
-            return {
-                "total_questions": total_questions,
-                "total_answered": total_answered,
-                "total_tool_calls": total_tool_calls,
-                "unique_users": unique_users,
-                "unique_guilds": unique_guilds,
-                "questions_today": questions_today,
-                "questions_week": questions_week,
-                "answer_rate": (
-                    (total_answered / total_questions * 100) if total_questions > 0 else 0
-                ),
-            }
+        stats = {
+            "total_questions": total_questions,
+            "total_answered": total_answered,
+            "total_tool_calls": total_tool_calls,
+            "unique_users": row["unique_users"],
+            "unique_guilds": row["unique_guilds"],
+            "questions_today": row["questions_today"],
+            "questions_week": row["questions_week"],
+            "answer_rate": (
+                (total_answered / total_questions * 100) if total_questions > 0 else 0
+            ),
+        }
+        self._store_stats(None, stats)
+        return stats
 
 
 # Global instance
@@ -1,10 +1,10 @@
 """Discord bot with menu-based support system and analytics."""
 
+import asyncio
 import random
 import subprocess
 import time
-from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timezone
 
 import discord
 from discord import app_commands
@@ -15,7 +15,6 @@ from src.server_config import server_config
 from src.admin_store import admin_store
 from src.agent.runner import AgentRunner, AgentStep, ButtonData
 from src.agent.client import OpenRouterClient
-from src.docs.scraper import scrape_all_docs
 from src.docs.search import doc_search
 from src.docs.store import doc_store
 from src.analytics import analytics
@@ -30,6 +29,9 @@ from src.views.support_menu import (
 EMBED_DESCRIPTION_LIMIT = 4096
 EMBED_FIELD_LIMIT = 1024
 
+# Soft cap on tracked rate-limiter users; crossing it triggers a prune
+RATE_LIMITER_MAX_USERS = 50_000
+
 
 def get_git_commit() -> str:
     """Get the current git commit hash (short)."""
@@ -53,40 +55,54 @@ EMBED_TOTAL_LIMIT = 6000
 
 
 class RateLimiter:
-    """Simple per-user rate limiter."""
+    """Per-user GCRA rate limiter.
+
+    Stores a single float per user (the theoretical arrival time of their
+    next request) instead of a window of timestamps, so each check is a few
+    arithmetic ops - no sweep, no per-request allocation. Uses the monotonic
+    clock so NTP adjustments can't distort the window.
+    """
+
+    __slots__ = ("requests_per_minute", "emission_interval", "burst", "tat")
 
     def __init__(self, requests_per_minute: int):
         self.requests_per_minute = requests_per_minute
-        self.user_requests: dict[int, list[float]] = defaultdict(list)
+        self.emission_interval = 60.0 / requests_per_minute
+        self.burst = requests_per_minute * self.emission_interval
+        self.tat: dict[int, float] = {}
 
     def is_allowed(self, user_id: int) -> bool:
         """Check if user is allowed to make a request."""
-        now = time.time()
-        minute_ago = now - 60
-
-        # Clean old requests
-        self.user_requests[user_id] = [t for t in self.user_requests[user_id] if t > minute_ago]
-
-        if len(self.user_requests[user_id]) >= self.requests_per_minute:
+        now = time.monotonic()
+        tat = max(self.tat.get(user_id, now), now)
+        if tat - now > self.burst - self.emission_interval:
             return False
-
-        self.user_requests[user_id].append(now)
+        self.tat[user_id] = tat + self.emission_interval
+        if len(self.tat) > RATE_LIMITER_MAX_USERS:
+            self.prune(now)
         return True
 
+    def prune(self, now: float | None = None) -> None:
+        """Drop users whose allowance has fully refilled.
+
+        An expired entry is indistinguishable from an unknown user, so this
+        is lossless; it keeps the state dict from growing with every user
+        ID ever seen.
+        """
+        if now is None:
+            now = time.monotonic()
+        self.tat = {uid: t for uid, t in self.tat.items() if t > now}
+
     def time_until_allowed(self, user_id: int) -> float:
         """Get seconds until user can make another request."""
-        if not self.user_requests[user_id]:
-            return 0
-
-        oldest = min(self.user_requests[user_id])
-        return max(0, 60 - (time.time() - oldest))
+        now = time.monotonic()
+        tat = self.tat.get(user_id, now)
+        return max(0.0, tat - now - (self.burst - self.emission_interval))
 
 
 def truncate_text(text: str, limit: int) -> str:
     """Truncate text to fit within limit."""
-    if len(text) <= limit:
-        return text
-    return text[: limit - 3] + "..."
+    return text if len(text) <= limit else f"{text[:limit - 3]}..."
 
 
 def create_response_embed(
@@ -107,17 +123,17 @@ def create_response_embed(
         )
         embed.title = truncate_text(question, 256)
 
-    # Add steps summary as a field
+    # Add steps summary as a field. Only this one field can exist, so its
+    # length is known directly - no need to re-scan embed.fields below.
+    field_length = 0
     if steps_summary:
-        embed.add_field(
-            name="🔧 What I checked",
-            value=truncate_text(steps_summary, EMBED_FIELD_LIMIT),
-            inline=False,
-        )
+        field_name = "🔧 What I checked"
+        field_value = truncate_text(steps_summary, EMBED_FIELD_LIMIT)
+        embed.add_field(name=field_name, value=field_value, inline=False)
+        field_length = len(field_name) + len(field_value)
 
     # Add response as description
     # Account for field length in total
-    field_length = sum(len(f.name) + len(str(f.value)) for f in embed.fields)
     title_length = len(embed.title or "")
     available_for_description = min(
         EMBED_DESCRIPTION_LIMIT,
@@ -129,23 +145,92 @@ def create_response_embed(
     return embed
 
 
-def create_thinking_embed(steps: list[AgentStep]) -> discord.Embed:
-    """Create an embed showing current thinking/tool steps."""
+def create_thinking_embed(steps_text: str | None = None) -> discord.Embed:
+    """Create an embed showing current thinking/tool steps.
+
+    Callers keep a running list of formatted tool lines and pass the joined
+    text in, so the step list isn't re-filtered on every update.
+    """
     embed = discord.Embed(
         title="🤖 Processing...",
         color=discord.Color.orange(),
     )
+    # Long agent runs can push the joined step lines past the embed limit
+    embed.description = (
+        truncate_text(steps_text, EMBED_DESCRIPTION_LIMIT)
+        if steps_text
+        else "🔄 Analyzing your question..."
+    )
+    return embed
 
-    if steps:
-        steps_text = "\n".join(
-            f"{step.emoji} {step.description}" for step in steps if step.type == "tool_call"
-        )
-        if steps_text:
-            embed.description = steps_text
-    else:
-        embed.description = "🔄 Analyzing your question..."
 
-    return embed
+# Static embeds built once at import time; these never change per call and
+# discord.py only reads them when sending
+AGENT_ERROR_EMBED = discord.Embed(
+    description="❌ Sorry, I encountered an error processing your request.",
+    color=discord.Color.red(),
+)
+IRRELEVANT_EMBED = discord.Embed(
+    description="🤔 This question doesn't seem to be about Xenon. I can only help with Xenon-related questions.",
+    color=discord.Color.greyple(),
+)
+NO_RESPONSE_EMBED = discord.Embed(
+    description="🤔 I couldn't generate a response. Please try rephrasing your question.",
+    color=discord.Color.orange(),
+)
+
+
+# Minimum spacing between streaming embed edits
+EDIT_DEBOUNCE_SECONDS = 0.5
+
+
+class EditDebouncer:
+    """Coalesces streaming embed edits into at most one PATCH per window.
+
+    Every tool step overwrites the pending embed; one background task sends
+    whatever is latest once the debounce window elapses. Back-to-back steps
+    therefore cost a single Discord API call instead of one each, which also
+    keeps the bot clear of the per-channel edit rate limit.
+    """
+
+    __slots__ = ("interaction", "delay", "_pending", "_task", "_last_sent")
+
+    def __init__(
+        self,
+        interaction: discord.Interaction,
+        delay: float = EDIT_DEBOUNCE_SECONDS,
+    ):
+        self.interaction = interaction
+        self.delay = delay
+        self._pending: discord.Embed | None = None
+        self._task: asyncio.Task | None = None
+        self._last_sent: str | None = None
+
+    def schedule(self, embed: discord.Embed) -> None:
+        """Record the newest embed state; flushes after the debounce window."""
+        self._pending = embed
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.delay)
+        embed = self._pending
+        self._pending = None
+        if embed is None or embed.description == self._last_sent:
+            # Nothing new since the last PATCH; don't spend an API call
+            return
+        self._last_sent = embed.description
+        try:
+            await self.interaction.edit_original_response(embed=embed)
+        except discord.HTTPException as e:
+            print(f"Failed to edit response: {e}")
+
+    def cancel(self) -> None:
+        """Drop any pending edit; used when a terminal edit supersedes it."""
+        self._pending = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
 
 
 class XenonSupportBot(commands.Bot):
@@ -162,9 +247,12 @@ class XenonSupportBot(commands.Bot):
         )
 
         self.rate_limiter = RateLimiter(settings.rate_limit_per_minute)
+        self.user_locks: dict[int, asyncio.Lock] = {}
+        # Latched true once docs exist; they only un-initialize via /scrape
+        self._docs_ready = False
         self.openrouter_client = OpenRouterClient()
         self.agent_runner = AgentRunner(self.openrouter_client)
-        self.start_time = datetime.utcnow()
+        self.start_time = datetime.now(timezone.utc)
 
     async def setup_hook(self):
         """Set up slash commands and persistent views."""
@@ -172,9 +260,17 @@ class XenonSupportBot(commands.Bot):
         from src.database import init_schema
         await init_schema()
 
+        # Resolve the analytics pool handle now so the first question
+        # doesn't pay the lookup
+        await analytics._get_pool()
+
         # Register persistent view
         self.add_view(SupportMenuView(on_question=self.handle_question))
 
+        # Sweep refilled rate-limiter entries in the background so idle
+        # users don't linger until the soft cap forces a prune
+        self._prune_task = asyncio.create_task(self._prune_rate_limiter())
+
         # Add commands
         self.tree.add_command(setup_support_menu_command)
         self.tree.add_command(support_analytics_command)
@@ -185,6 +281,12 @@ class XenonSupportBot(commands.Bot):
         self.tree.add_command(about_command)
         await self.tree.sync()
 
+    async def _prune_rate_limiter(self) -> None:
+        """Periodically drop rate-limiter entries for users gone idle."""
+        while not self.is_closed():
+            await asyncio.sleep(300)
+            self.rate_limiter.prune()
+
     async def on_ready(self):
         print(f"Logged in as {self.user}")
         print(f"Whitelisted admins: {admin_store.get_all()}")
@@ -303,7 +405,31 @@ class XenonSupportBot(commands.Bot):
         interaction: discord.Interaction,
         question: str,
     ) -> None:
-        """Handle a support question from the menu modal."""
+        """Handle a support question from the menu modal.
+
+        Runs are serialized per user: a second question while the first is
+        still streaming would race to edit the same ephemeral response and
+        burn LLM tokens on a superseded question, so it's rejected up front.
+        """
+        user_id = interaction.user.id
+        lock = self.user_locks.setdefault(user_id, asyncio.Lock())
+        if lock.locked():
+            await interaction.response.send_message(
+                "⏳ Still processing your previous question. Please wait for it to finish.",
+                ephemeral=True,
+            )
+            return
+
+        async with lock:
+            await self._handle_question(interaction, question)
+        # Rejected-when-locked means nobody else is waiting on this lock
+        self.user_locks.pop(user_id, None)
+
+    async def _handle_question(
+        self,
+        interaction: discord.Interaction,
+        question: str,
+    ) -> None:
         # Check rate limit
         if not self.rate_limiter.is_allowed(interaction.user.id):
             wait_time = self.rate_limiter.time_until_allowed(interaction.user.id)
@@ -313,8 +439,12 @@ class XenonSupportBot(commands.Bot):
             )
             return
 
-        # Auto-scrape if docs aren't initialized
-        if not await doc_store.is_initialized():
+        # Auto-scrape if docs aren't initialized. The DB check only runs
+        # until it first succeeds; after that the cached flag answers.
+        if not self._docs_ready:
+            self._docs_ready = await doc_store.is_initialized()
+
+        if not self._docs_ready:
             await interaction.response.send_message(
                 embed=discord.Embed(
                     description="📚 Documentation not loaded yet. Auto-scraping...",
@@ -324,8 +454,11 @@ class XenonSupportBot(commands.Bot):
             )
 
             try:
+                from src.docs.scraper import scrape_all_docs
+
                 docs = await scrape_all_docs()
                 await doc_search.rebuild_index()
+                self._docs_ready = True
                 await interaction.edit_original_response(
                     embed=discord.Embed(
                         description=f"✅ Scraped {len(docs)} documentation pages. Processing your question...",
@@ -343,7 +476,7 @@ class XenonSupportBot(commands.Bot):
         else:
             # Send initial processing message (ephemeral)
             await interaction.response.send_message(
-                embed=create_thinking_embed([]),
+                embed=create_thinking_embed(),
                 ephemeral=True,
             )
 
@@ -365,8 +498,10 @@ class XenonSupportBot(commands.Bot):
 
         # Run agent
         steps: list[AgentStep] = []
+        tool_lines: list[str] = []  # Grown incrementally for the thinking embed
+        debouncer = EditDebouncer(interaction)
         final_response: str | None = None
-        response_buttons: list[ButtonData] = []
+        response_buttons: tuple[ButtonData, ...] = ()
         is_irrelevant = False
 
         try:
@@ -377,8 +512,8 @@ class XenonSupportBot(commands.Bot):
                 steps.append(step)
 
                 if step.type == "tool_call":
-                    thinking_embed = create_thinking_embed(steps)
-                    await interaction.edit_original_response(embed=thinking_embed)
+                    tool_lines.append(f"{step.emoji} {step.description}")
+                    debouncer.schedule(create_thinking_embed("\n".join(tool_lines)))
 
                 elif step.type == "irrelevant":
                     is_irrelevant = True
@@ -390,19 +525,14 @@ class XenonSupportBot(commands.Bot):
 
         except Exception as e:
             print(f"Agent error: {e}")
-            error_embed = discord.Embed(
-                description="❌ Sorry, I encountered an error processing your request.",
-                color=discord.Color.red(),
-            )
-            await interaction.edit_original_response(embed=error_embed)
+            debouncer.cancel()
+            await interaction.edit_original_response(embed=AGENT_ERROR_EMBED)
             return
 
+        debouncer.cancel()
+
         if is_irrelevant:
-            irrelevant_embed = discord.Embed(
-                description="🤔 This question doesn't seem to be about Xenon. I can only help with Xenon-related questions.",
-                color=discord.Color.greyple(),
-            )
-            await interaction.edit_original_response(embed=irrelevant_embed)
+            await interaction.edit_original_response(embed=IRRELEVANT_EMBED)
             return
 
         if final_response:
@@ -475,11 +605,7 @@ class XenonSupportBot(commands.Bot):
 
             await interaction.edit_original_response(embed=response_embed, view=view)
         else:
-            no_response_embed = discord.Embed(
-                description="🤔 I couldn't generate a response. Please try rephrasing your question.",
-                color=discord.Color.orange(),
-            )
-            await interaction.edit_original_response(embed=no_response_embed)
+            await interaction.edit_original_response(embed=NO_RESPONSE_EMBED)
 
     async def handle_followup_question(
         self,
@@ -501,7 +627,7 @@ class XenonSupportBot(commands.Bot):
 
         # Send processing message
         await interaction.response.send_message(
-            embed=create_thinking_embed([]),
+            embed=create_thinking_embed(),
             ephemeral=True,
         )
 
@@ -519,8 +645,10 @@ class XenonSupportBot(commands.Bot):
 
         # Run agent with history
         steps: list[AgentStep] = []
+        tool_lines: list[str] = []  # Grown incrementally for the thinking embed
+        debouncer = EditDebouncer(interaction)
         final_response: str | None = None
-        response_buttons: list[ButtonData] = []
+        response_buttons: tuple[ButtonData, ...] = ()
         is_irrelevant = False
 
         try:
@@ -532,8 +660,8 @@ class XenonSupportBot(commands.Bot):
                 steps.append(step)
 
                 if step.type == "tool_call":
-                    thinking_embed = create_thinking_embed(steps)
-                    await interaction.edit_original_response(embed=thinking_embed)
+                    tool_lines.append(f"{step.emoji} {step.description}")
+                    debouncer.schedule(create_thinking_embed("\n".join(tool_lines)))
 
                 elif step.type == "irrelevant":
                     is_irrelevant = True
@@ -545,19 +673,14 @@ class XenonSupportBot(commands.Bot):
 
         except Exception as e:
             print(f"Agent error: {e}")
-            error_embed = discord.Embed(
-                description="❌ Sorry, I encountered an error processing your request.",
-                color=discord.Color.red(),
-            )
-            await interaction.edit_original_response(embed=error_embed)
+            debouncer.cancel()
+            await interaction.edit_original_response(embed=AGENT_ERROR_EMBED)
             return
 
+        debouncer.cancel()
+
         if is_irrelevant:
-            irrelevant_embed = discord.Embed(
-                description="🤔 This question doesn't seem to be about Xenon. I can only help with Xenon-related questions.",
-                color=discord.Color.greyple(),
-            )
-            await interaction.edit_original_response(embed=irrelevant_embed)
+            await interaction.edit_original_response(embed=IRRELEVANT_EMBED)
             return
 
         if final_response:
@@ -630,11 +753,7 @@ class XenonSupportBot(commands.Bot):
 
             await interaction.edit_original_response(embed=response_embed, view=view)
         else:
-            no_response_embed = discord.Embed(
-                description="🤔 I couldn't generate a response. Please try rephrasing your question.",
-                color=discord.Color.orange(),
-            )
-            await interaction.edit_original_response(embed=no_response_embed)
+            await interaction.edit_original_response(embed=NO_RESPONSE_EMBED)
 
 
 # Config command group
@@ -698,6 +817,7 @@ async def config_show(interaction: discord.Interaction):
 @app_commands.command(name="scrape", description="Scrape Xenon documentation (admin only)")
 async def scrape_command(interaction: discord.Interaction):
     """Scrape documentation command."""
+    bot: XenonSupportBot = interaction.client  # type: ignore
     member = interaction.user if isinstance(interaction.user, discord.Member) else None
     if not admin_store.is_admin_in_context(interaction.user.id, member):
         await interaction.response.send_message(
@@ -709,8 +829,12 @@ async def scrape_command(interaction: discord.Interaction):
     await interaction.response.send_message("📚 Scraping Xenon documentation...", ephemeral=True)
 
     try:
+        # Imported lazily so startup doesn't pay for the scraping stack
+        from src.docs.scraper import scrape_all_docs
+
         docs = await scrape_all_docs()
         section_count = await doc_search.rebuild_index()
+        bot._docs_ready = True
 
         await interaction.followup.send(
             f"✅ Scraped {len(docs)} documentation pages and indexed {section_count} sections.",
@@ -861,7 +985,7 @@ async def support_unanswered_command(
     )
 
     for i, q in enumerate(questions[:10], 1):
-        question_preview = q.question[:100] + "..." if len(q.question) > 100 else q.question
+        question_preview = truncate_text(q.question, 100)
         community = " 💬" if q.community_support_clicked else ""
         embed.add_field(
             name=f"{i}. {q.created_at.strftime('%Y-%m-%d %H:%M')}{community}",
@@ -903,7 +1027,7 @@ async def stats_command(interaction: discord.Interaction):
     stats = await analytics.get_global_stats()
 
     # Calculate uptime
-    uptime = datetime.utcnow() - bot.start_time
+    uptime = datetime.now(timezone.utc) - bot.start_time
     uptime_str = format_uptime(uptime)
 
     # Get bot info
@@ -15,6 +15,13 @@ async def get_pool() -> asyncpg.Pool:
             settings.database_url,
             min_size=2,
             max_size=10,
+            # The bot runs a small, fixed set of statements; a large cache
+            # keeps them all prepared on every connection, and a lifetime of
+            # 0 means cached plans never expire (schema only changes on
+            # deploy). Idle connections are recycled after five minutes.
+            statement_cache_size=1024,
+            max_cached_statement_lifetime=0,
+            max_inactive_connection_lifetime=300,
         )
     return _pool
 
@@ -83,13 +90,28 @@ async def init_schema() -> None:
             )
         """)
 
-        # Create indexes
+        # Create indexes. The composite index matches the analytics access
+        # pattern (guild_id equality + created_at range/order); the partial
+        # index covers the unanswered listing without indexing the answered
+        # majority. Indexes an older schema created that the planner no
+        # longer needs are dropped: the boolean answered index is useless on
+        # its own, and the single-column guild_id index is a leading prefix
+        # of the composite.
         await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_questions_guild ON questions(guild_id)"
+            """
+            CREATE INDEX IF NOT EXISTS idx_questions_guild_time
+            ON questions(guild_id, created_at DESC)
+            """
         )
         await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_questions_answered ON questions(answered)"
+            """
+            CREATE INDEX IF NOT EXISTS idx_questions_unanswered
+            ON questions(guild_id, created_at DESC)
+            WHERE NOT answered
+            """
         )
+        await conn.execute("DROP INDEX IF EXISTS idx_questions_answered")
+        await conn.execute("DROP INDEX IF EXISTS idx_questions_guild")
         await conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_questions_created ON questions(created_at)"
         )
@@ -5,9 +5,10 @@ import json
 import re
 from dataclasses import dataclass, asdict
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import httpx
-from bs4 import BeautifulSoup
+if TYPE_CHECKING:
+    import httpx
 
 
 WIKI_BASE = "https://wiki.xenon.bot"
@@ -111,8 +112,13 @@ def extract_content_html(html: str) -> str:
     return html[start_pos:]
 
 
-async def scrape_page(client: httpx.AsyncClient, slug: str, path: str) -> DocPage | None:
+async def scrape_page(client: "httpx.AsyncClient", slug: str, path: str) -> DocPage | None:
     """Scrape a single wiki page."""
+    # Imported here so modules that only need DocPage/DocSection don't pull
+    # in the scraping stack
+    import httpx
+    from bs4 import BeautifulSoup
+
     url = f"{WIKI_BASE}{path}"
     try:
         resp = await client.get(url, follow_redirects=True)
@@ -209,6 +215,8 @@ async def scrape_page(client: httpx.AsyncClient, slug: str, path: str) -> DocPag
 
 async def scrape_all_docs() -> list[DocPage]:
     """Scrape all documentation pages and save to database."""
+    import httpx
+
     from src.docs.store import doc_store
 
     async with httpx.AsyncClient(timeout=30.0) as client:
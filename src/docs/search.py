@@ -1,13 +1,16 @@
 """Full-text search over documentation using Whoosh."""
 
+import asyncio
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from whoosh import index
 from whoosh.fields import Schema, TEXT, ID, STORED
 from whoosh.qparser import MultifieldParser, OrGroup
 from whoosh.analysis import StemmingAnalyzer
 
-from src.docs.scraper import DEFAULT_DATA_DIR
+if TYPE_CHECKING:
+    from src.docs.scraper import DocPage
 
 
 # Schema for the search index
@@ -24,8 +27,14 @@ class DocSearch:
     """Full-text search over Xenon documentation."""
 
     def __init__(self, index_dir: Path | None = None):
-        self.index_dir = index_dir or (DEFAULT_DATA_DIR / "index")
+        if index_dir is None:
+            from src.docs.scraper import DEFAULT_DATA_DIR
+
+            index_dir = DEFAULT_DATA_DIR / "index"
+        self.index_dir = index_dir
         self._ix: index.Index | None = None
+        # Bumped on every rebuild; callers key result caches on this
+        self.version = 0
 
     def _get_or_create_index(self) -> index.Index:
         """Get existing index or create new one."""
@@ -45,6 +54,15 @@ class DocSearch:
         """Rebuild the search index from stored docs in PostgreSQL."""
         from src.docs.store import doc_store
 
+        docs = await doc_store.get_all_docs()
+        # Whoosh indexing (analysis + segment writes) is synchronous CPU and
+        # disk work; run it off the event loop so the bot stays responsive
+        doc_count = await asyncio.to_thread(self._build_index, docs)
+        self.version += 1
+        return doc_count
+
+    def _build_index(self, docs: list["DocPage"]) -> int:
+        """Build a fresh index from the given docs; returns section count."""
         self.index_dir.mkdir(parents=True, exist_ok=True)
 
         # Always create fresh index
@@ -54,7 +72,7 @@ class DocSearch:
         writer = ix.writer()
         doc_count = 0
 
-        for doc in await doc_store.get_all_docs():
+        for doc in docs:
             for section in doc.sections:
                 writer.add_document(
                     slug=doc.slug,
@@ -72,7 +90,9 @@ class DocSearch:
         """
         Search documentation for a query.
 
-        Returns list of matching sections with slug, title, heading, snippet.
+        Returns list of matching sections with slug, title, heading, snippet,
+        already shaped for the LLM tool result (hits arrive in score order,
+        so the score itself isn't included).
         """
         ix = self._get_or_create_index()
 
@@ -103,7 +123,6 @@ class DocSearch:
                         "title": hit["title"],
                         "heading": hit.get("heading", ""),
                         "snippet": snippet,
-                        "score": hit.score,
                     }
                 )
 
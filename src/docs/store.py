@@ -19,6 +19,11 @@ class DocInfo:
 class DocStore:
     """Manages stored documentation in PostgreSQL."""
 
+    def __init__(self):
+        # Bumped on every mutation; callers key caches on this
+        self.version = 0
+        self._slugs_cache: tuple[int, list[str]] | None = None
+
     async def get_manifest(self) -> list[DocInfo]:
         """Get list of all available docs (titles only, no content)."""
         pool = await get_pool()
@@ -39,6 +44,18 @@ class DocStore:
             lines.append(f"- {doc.title} (slug: {doc.slug})")
         return "\n".join(lines)
 
+    async def get_slugs(self) -> list[str]:
+        """Get all doc slugs, cached until the docs change."""
+        if self._slugs_cache is not None and self._slugs_cache[0] == self.version:
+            return self._slugs_cache[1]
+
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch("SELECT slug FROM doc_pages ORDER BY slug")
+        slugs = [r["slug"] for r in rows]
+        self._slugs_cache = (self.version, slugs)
+        return slugs
+
     async def get_doc(self, slug: str) -> DocPage | None:
         """Get full document content by slug."""
         pool = await get_pool()
@@ -118,12 +135,14 @@ class DocStore:
                 doc.url,
                 sections_json,
             )
+        self.version += 1
 
     async def clear_all(self) -> None:
         """Clear all documents from the database."""
         pool = await get_pool()
         async with pool.acquire() as conn:
             await conn.execute("DELETE FROM doc_pages")
+        self.version += 1
 
 
 # Global instance
@@ -111,6 +111,13 @@ class SupportResponseView(discord.ui.View):
         self.on_community_support = on_community_support
         self.on_followup = on_followup
         self.on_rephrase = on_rephrase
+        # The decorator-declared buttons are the only disableable items;
+        # link buttons added later never need touching
+        self._action_buttons = [
+            self.resolved_button,
+            self.followup_button,
+            self.community_support_button,
+        ]
 
     @discord.ui.button(
         label="Resolved",
@@ -126,9 +133,8 @@ class SupportResponseView(discord.ui.View):
         await self.on_resolved(self.question_id)
 
         # Disable only interactive buttons (not link buttons)
-        for item in self.children:
-            if isinstance(item, discord.ui.Button) and item.style != discord.ButtonStyle.link:
-                item.disabled = True
+        for item in self._action_buttons:
+            item.disabled = True
 
         # Update message
         embed = interaction.message.embeds[0] if interaction.message and interaction.message.embeds else None
@@ -176,9 +182,8 @@ class SupportResponseView(discord.ui.View):
         await self.on_community_support(self.question_id)
 
         # Disable only interactive buttons (not link buttons)
-        for item in self.children:
-            if isinstance(item, discord.ui.Button) and item.style != discord.ButtonStyle.link:
-                item.disabled = True
+        for item in self._action_buttons:
+            item.disabled = True
 
         # Update message with footer
         embed = interaction.message.embeds[0] if interaction.message and interaction.message.embeds else None